@@ -26,6 +26,9 @@ DEFAULT_SMTP_HOST = 'smtp.gmail.com'
 DEFAULT_SMTP_PORT = 587
 ENV_USER = 'GMAIL_USER'
 ENV_APP_PASSWORD = 'GMAIL_APP_PASSWORD'
+# 이 예외들은 서버가 RSET으로 상태를 되돌린 뒤라 같은 연결로 계속 보낼 수 있다
+# (단, 421 응답이면 smtplib 가 연결을 이미 닫고 같은 예외를 던지므로 server.sock 도 확인)
+SMTP_RECOVERABLE = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
 
 
 def read_targets(csv_path: str) -> List[Tuple[str, str]]:
@@ -116,6 +119,64 @@ def build_message(sender: str,
     return msg
 
 
+def connect_smtp(host: str,
+                 port: int,
+                 username: str,
+                 password: str,
+                 use_ssl: bool = False,
+                 debug: bool = False) -> smtplib.SMTP:
+    """
+    SMTP 서버에 접속해 로그인까지 마친 연결을 반환한다.
+    """
+    context = ssl.create_default_context()
+    if use_ssl:
+        server = smtplib.SMTP_SSL(host=host, port=port, context=context, timeout=30)
+    else:
+        server = smtplib.SMTP(host=host, port=port, timeout=30)
+
+    try:
+        if debug:
+            server.set_debuglevel(1)
+        if not use_ssl:
+            server.ehlo()
+            server.starttls(context=context)
+            server.ehlo()
+        server.login(user=username, password=password)
+    except BaseException:
+        server.close()
+        raise
+    return server
+
+
+def close_smtp(server: smtplib.SMTP) -> None:
+    """
+    QUIT를 보내고 연결을 닫는다. 이미 끊긴 연결이어도 조용히 닫는다.
+    """
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
+def smtp_error(e: OSError) -> RuntimeError:
+    """
+    SMTP/네트워크 예외를 사용자에게 보여줄 메시지로 바꾼다.
+    """
+    if isinstance(e, smtplib.SMTPAuthenticationError):
+        return RuntimeError('인증 실패: 계정/비밀번호(또는 앱 비밀번호)를 확인하세요.')
+    if isinstance(e, smtplib.SMTPConnectError):
+        return RuntimeError('SMTP 서버에 연결하지 못했습니다. 호스트/포트 또는 방화벽 설정을 확인하세요.')
+    if isinstance(e, smtplib.SMTPRecipientsRefused):
+        return RuntimeError(f'수신자가 거부되었습니다: {e.recipients}')
+    if isinstance(e, smtplib.SMTPSenderRefused):
+        return RuntimeError(f'발신자가 거부되었습니다: {e.sender}')
+    if isinstance(e, smtplib.SMTPException):
+        return RuntimeError(f'SMTP 오류가 발생했습니다: {e}')
+    if isinstance(e, (socket.gaierror, TimeoutError)):
+        return RuntimeError('네트워크 오류가 발생했습니다. DNS/네트워크 연결을 확인하세요.')
+    return RuntimeError(f'시스템 오류가 발생했습니다: {e}')
+
+
 def send_mail(host: str,
               port: int,
               username: str,
@@ -126,38 +187,14 @@ def send_mail(host: str,
     """
     SMTP 서버에 접속하여 메일을 전송한다.
     """
-    context = ssl.create_default_context()
-
     try:
-        if use_ssl:
-            with smtplib.SMTP_SSL(host=host, port=port, context=context, timeout=30) as server:
-                if debug:
-                    server.set_debuglevel(1)
-                server.login(user=username, password=password)
-                server.send_message(message)
-        else:
-            with smtplib.SMTP(host=host, port=port, timeout=30) as server:
-                if debug:
-                    server.set_debuglevel(1)
-                server.ehlo()
-                server.starttls(context=context)
-                server.ehlo()
-                server.login(user=username, password=password)
-                server.send_message(message)
-    except smtplib.SMTPAuthenticationError as e:
-        raise RuntimeError('인증 실패: 계정/비밀번호(또는 앱 비밀번호)를 확인하세요.') from e
-    except smtplib.SMTPConnectError as e:
-        raise RuntimeError('SMTP 서버에 연결하지 못했습니다. 호스트/포트 또는 방화벽 설정을 확인하세요.') from e
-    except smtplib.SMTPRecipientsRefused as e:
-        raise RuntimeError(f'수신자가 거부되었습니다: {e.recipients}') from e
-    except smtplib.SMTPSenderRefused as e:
-        raise RuntimeError(f'발신자가 거부되었습니다: {e.sender}') from e
-    except smtplib.SMTPException as e:
-        raise RuntimeError(f'SMTP 오류가 발생했습니다: {e}') from e
-    except (socket.gaierror, TimeoutError) as e:
-        raise RuntimeError('네트워크 오류가 발생했습니다. DNS/네트워크 연결을 확인하세요.') from e
+        server = connect_smtp(host, port, username, password, use_ssl=use_ssl, debug=debug)
+        try:
+            server.send_message(message)
+        finally:
+            close_smtp(server)
     except OSError as e:
-        raise RuntimeError(f'시스템 오류가 발생했습니다: {e}') from e
+        raise smtp_error(e) from e
 
 
 def parse_args() -> argparse.Namespace:
@@ -269,6 +306,11 @@ def main() -> None:
             sys.exit(1)
         return
 
+    # 수신자마다 접속/TLS/로그인을 반복하지 않고 연결 하나를 재사용한다.
+    # (수신자 거부 등은 서버가 RSET 후 연결을 유지하므로 다음 수신자로 계속 진행,
+    #  연결 자체가 끊기면 다음 수신자에서 다시 접속)
+    use_ssl = args.ssl or args.port == 465
+    server: Optional[smtplib.SMTP] = None
     ok = 0
     fail = 0
     for name, email_addr in targets:
@@ -292,20 +334,22 @@ def main() -> None:
             continue
 
         try:
-            send_mail(
-                host=args.host,
-                port=args.port,
-                username=username,
-                password=app_password,
-                message=msg,
-                use_ssl=args.ssl or args.port == 465,
-                debug=args.debug,
-            )
+            if server is None or server.sock is None:
+                server = connect_smtp(args.host, args.port, username, app_password,
+                                      use_ssl=use_ssl, debug=args.debug)
+            server.send_message(msg)
             ok += 1
             print(f'전송 성공: {email_addr}')
         except Exception as e:
             fail += 1
-            print(f'전송 실패({email_addr}): {e}', file=sys.stderr)
+            reason = smtp_error(e) if isinstance(e, OSError) else e
+            print(f'전송 실패({email_addr}): {reason}', file=sys.stderr)
+            if server is not None and (server.sock is None or not isinstance(e, SMTP_RECOVERABLE)):
+                close_smtp(server)
+                server = None
+
+    if server is not None:
+        close_smtp(server)
 
     print(f'요약: 성공 {ok}건, 실패 {fail}건, 총 {ok + fail}건 처리됨.')
     if ok == 0:
@@ -1,27 +1,247 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import codecs
+import os
+import selectors
 import socket
+import stat
 import threading
 import sys
 
+RECV_SIZE = 65536        # 한 번에 읽을 최소 크기 (4KiB면 syscall 수만 늘어남)
+RECV_SIZE_MAX = 1 << 20  # 수신 버퍼 상한 (메모리 제한)
+SOCK_BUF_SIZE = 1 << 20  # 커널 송수신 버퍼
+MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0)  # Windows엔 없음
+SHUTDOWN_TIMEOUT = 1.0   # 종료 시 서버의 마지막 메시지를 기다리는 시간(초)
+NL = b'\n'
+QUIT = '/종료'.encode('utf-8')  # 매 줄 비교용으로 한 번만 인코딩
+
+
+def is_utf8(stream) -> bool:
+    # 스트림 인코딩이 UTF-8인지 (프로토콜이 UTF-8이라 그대로 바이트를 주고받아도 되는지)
+    try:
+        return codecs.lookup(stream.encoding).name == 'utf-8'
+    except (AttributeError, LookupError, TypeError):
+        return False
+
+
+def raw_stdout_fd() -> int | None:
+    # stdout이 UTF-8이면 받은 바이트를 디코딩/재인코딩 없이 fd에 바로 씀.
+    # Windows 콘솔은 fd에 직접 쓰면 코드페이지 문제로 깨지므로 제외
+    if sys.platform == 'win32':
+        return None
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, ValueError, OSError):
+        return None
+    if not is_utf8(sys.stdout):
+        return None
+    return fd
+
+
+class LineReceiver:
+    # 소켓에서 받은 데이터를 줄 단위로 화면에 출력 (셀렉터/스레드 양쪽에서 사용)
+    # 바이트당 CPU 일은 거의 없고 비용은 syscall/메모리 할당 횟수가 대부분.
+    # 그래서 recv는 RECV_SIZE(64KiB 이상)로 크게, 버퍼는 재사용하고,
+    # 덩어리마다 bytes 객체를 만들지 않는다. SIMD/JIT류 최적화는 여기선 이득 없음.
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        # 미리 잡아 둔 버퍼에 바로 받음 (recv/줄마다 bytes를 새로 만들지 않음).
+        # 커널 수신 버퍼 크기에 맞춰서 recv 한 번에 큐를 다 비울 수 있게 함
+        # (리눅스는 SO_RCVBUF를 설정값의 2배로 돌려주므로 상한을 둠)
+        rcvbuf = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        self.buf = bytearray(min(max(RECV_SIZE, rcvbuf), RECV_SIZE_MAX))
+        self.mv = memoryview(self.buf)
+        self.tail = bytearray()  # 아직 개행이 안 온 줄
+        self.out_fd = raw_stdout_fd()
+        if self.out_fd is not None:
+            sys.stdout.flush()  # 앞서 print한 내용과 순서가 섞이지 않게
+
+    def on_readable(self) -> bool:
+        # 읽어서 출력. 연결이 끝났으면 False.
+        # 버퍼가 꽉 차게 읽혔으면 커널 큐가 빌 때까지 기다리지 않고(DONTWAIT) 이어서 읽음
+        # -> 작은 readable 이벤트 여러 번 대신 select 1번 + 몰아 읽기
+        flags = 0
+        while True:
+            try:
+                n = self.sock.recv_into(self.mv, 0, flags)
+            except BlockingIOError:
+                return True
+            except OSError:
+                n = 0
+            if not n:
+                self.finish()
+                return False
+            self.feed(n)
+            if n < len(self.buf):
+                return True
+            flags = MSG_DONTWAIT
+
+    def feed(self, n: int) -> None:
+        # 개행 검색은 새로 받은 부분만 (이전 꼬리를 매번 다시 훑지 않음)
+        idx = self.buf.rfind(b'\n', 0, n)
+        if idx == -1:
+            self.tail += self.mv[:n]
+            return
+        # 한 번에 받은 완성된 줄들은 write 한 번으로 묶어서 출력
+        if self.tail:
+            self.tail += self.mv[:idx + 1]
+            self.write(self.tail)
+            self.tail = bytearray()
+        else:
+            self.write(self.mv[:idx + 1])
+        self.tail += self.mv[idx + 1:n]
+
+    def write(self, data) -> None:
+        # 완성된 줄만 넘어오므로 멀티바이트 문자가 중간에 잘리는 일은 없음
+        if self.out_fd is None:
+            text = str(data, 'utf-8', 'replace')
+            out = getattr(sys.stdout, 'buffer', None)
+            if out is None:
+                # IDLE 등 바이트 버퍼가 없는 콘솔
+                sys.stdout.write(text)
+            else:
+                # cp949 등에서 표현 못 하는 글자(이모지, U+FFFD)가 와도 수신 스레드가 죽지 않게 치환
+                sys.stdout.flush()
+                out.write(text.encode(sys.stdout.encoding or 'utf-8', 'replace'))
+            sys.stdout.flush()
+            return
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.out_fd, view):]
+
+    def finish(self) -> None:
+        if self.tail:
+            self.tail += NL
+            self.write(self.tail)
+            self.tail = bytearray()
+
 
 def recv_loop(sock: socket.socket) -> None:
-    buf = b''
+    receiver = LineReceiver(sock)
+    while receiver.on_readable():
+        pass
+
+
+def send_line(sock: socket.socket, data: bytes) -> None:
+    # 본문과 개행을 이어 붙이지 않고 sendmsg 한 번으로 보냄 (Windows엔 sendmsg 없음)
+    if not hasattr(sock, 'sendmsg'):
+        sock.sendall(data + NL)
+        return
+    sent = sock.sendmsg([data, NL])
+    if sent < len(data) + 1:
+        sock.sendall((data + NL)[sent:])
+
+
+def encode_text(text: str) -> bytes:
+    # 채팅은 대부분 ASCII라 그 경우엔 더 단순한 ascii 코덱으로 바로 인코딩
+    if text.isascii():
+        return text.encode('ascii')
+    return text.encode('utf-8')
+
+
+def stdin_lines():
+    # 파이프/파일 입력이 UTF-8이면 str로 디코딩했다 다시 인코딩하지 않고 bytes 그대로 넘김
+    # (cp949 등 다른 인코딩이면 그대로 보내면 깨지므로 아래 str 경로로)
+    if not sys.stdin.isatty() and is_utf8(sys.stdin):
+        for raw in sys.stdin.buffer:
+            yield raw.rstrip(b'\r\n')
+        yield QUIT
+        return
+    # 터미널이면 input() 유지 (줄 편집/히스토리), 그 밖에는 stdin 인코딩으로 디코딩
     while True:
         try:
-            chunk = sock.recv(4096)
-        except OSError:
-            break
-        if not chunk:
+            line = input()
+        except EOFError:
             break
-        buf += chunk
-        while b'\n' in buf:
-            line, buf = buf.split(b'\n', 1)
+        yield encode_text(line)
+    yield QUIT
+
+
+def shutdown_quietly(sock: socket.socket, how: int) -> None:
+    try:
+        sock.shutdown(how)
+    except OSError:
+        pass
+
+
+def stdin_selectable() -> bool:
+    # Windows의 select는 소켓만 받고, IDLE 등은 stdin에 fd가 없음.
+    # 셀렉터는 파이프/소켓 입력일 때만 사용:
+    #  - 일반 파일, /dev/null은 epoll에 등록이 안 됨(EPERM)
+    #  - 터미널은 input()의 줄 편집/히스토리를 유지하려고 스레드 방식으로 감
+    # stdin 바이트를 그대로 보내므로 인코딩이 UTF-8일 때만
+    if sys.platform == 'win32':
+        return False
+    try:
+        mode = os.fstat(sys.stdin.fileno()).st_mode
+    except (AttributeError, ValueError, OSError):
+        return False
+    if not (stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)):
+        return False
+    return is_utf8(sys.stdin)
+
+
+def select_loop(sock: socket.socket) -> None:
+    # 수신 스레드 없이 소켓과 stdin을 셀렉터(리눅스는 epoll) 하나로 같이 기다림
+    receiver = LineReceiver(sock)
+    stdin_fd = sys.stdin.fileno()
+    pending = b''
+    with selectors.DefaultSelector() as sel:
+        sel.register(sock, selectors.EVENT_READ, 'net')
+        sel.register(stdin_fd, selectors.EVENT_READ, 'stdin')
+        while True:
+            for key, _ in sel.select():
+                if key.data == 'net':
+                    if not receiver.on_readable():
+                        print('[INFO] 서버 연결 종료')
+                        return
+                    continue
+                chunk = os.read(stdin_fd, RECV_SIZE)
+                if chunk:
+                    *lines, pending = (pending + chunk).split(NL)
+                else:
+                    # stdin EOF면 남은 줄까지 보내고 종료
+                    lines = [pending, QUIT] if pending else [QUIT]
+                for data in lines:
+                    data = data.rstrip(b'\r')
+                    try:
+                        send_line(sock, data)
+                    except OSError:
+                        print('[INFO] 서버 연결 종료')
+                        return
+                    if data == QUIT:
+                        # 쓰기만 닫고(half-close) 서버가 보내던 마지막 메시지까지 받은 뒤 끝냄
+                        shutdown_quietly(sock, socket.SHUT_WR)
+                        sel.unregister(stdin_fd)
+                        while sel.select(SHUTDOWN_TIMEOUT) and receiver.on_readable():
+                            pass
+                        return
+
+
+def thread_loop(sock: socket.socket) -> None:
+    # 셀렉터를 못 쓰는 환경용: 수신은 스레드, 입력은 메인에서
+    t = threading.Thread(target=recv_loop, args=(sock,))
+    t.start()
+    try:
+        for data in stdin_lines():
             try:
-                print(line.decode('utf-8', errors='replace'))
-            except UnicodeDecodeError:
-                pass
+                send_line(sock, data)
+            except OSError:
+                print('[INFO] 서버 연결 종료')
+                break
+            if data == QUIT:
+                break
+    finally:
+        # 소켓을 닫아 버리지 않고 쓰기만 닫은 뒤, 수신 스레드가 EOF까지 받도록 기다림
+        shutdown_quietly(sock, socket.SHUT_WR)
+        t.join(SHUTDOWN_TIMEOUT)
+        if t.is_alive():
+            # 서버가 안 닫아 주면 읽기도 닫아서 막힌 recv를 깨움
+            shutdown_quietly(sock, socket.SHUT_RDWR)
+            t.join(SHUTDOWN_TIMEOUT)
 
 
 def main() -> None:
@@ -44,31 +264,24 @@ def main() -> None:
 
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # 수신 윈도우는 SYN 때 정해지므로 버퍼 크기는 connect 전에 설정
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCK_BUF_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCK_BUF_SIZE)
+        # 짧은 채팅 메시지라 Nagle 지연은 손해
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         sock.connect((host, port))
     except OSError as exc:
         print(f'[ERROR] 서버 접속 실패: {exc}')
         sys.exit(1)
 
     # 접속 즉시 닉네임 1줄 전송
-    sock.sendall((nickname + '\n').encode('utf-8'))
-
-    t = threading.Thread(target=recv_loop, args=(sock,), daemon=True)
-    t.start()
+    send_line(sock, encode_text(nickname))
 
     try:
-        while True:
-            try:
-                line = input()
-            except EOFError:
-                line = '/종료'
-            text = (line or '').rstrip('\n')
-            try:
-                sock.sendall((text + '\n').encode('utf-8'))
-            except OSError:
-                print('[INFO] 서버 연결 종료')
-                break
-            if text == '/종료':
-                break
+        if stdin_selectable():
+            select_loop(sock)
+        else:
+            thread_loop(sock)
     finally:
         try:
             sock.close()
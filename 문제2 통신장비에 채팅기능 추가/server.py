@@ -1,113 +1,290 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import asyncio
 import socket
-import threading
 
-clients = {}           # sock -> nickname
-clients_lock = threading.Lock()
+# 이벤트 루프 스레드 하나에서만 건드리므로 락이 필요 없음.
+# 입장/퇴장 때는 복사본을 만들어 통째로 바꿔 끼움(copy-on-write) -> 방송할 때는 복사 없이 순회
+clients = {}           # writer -> nickname
+nick_to_writer = {}    # nickname -> writer (귓속말 대상 O(1) 조회용 역색인)
+
+# 클라이언트별 보낼 메시지 큐. 전송은 클라이언트마다 하나씩 도는 sender()가 맡음
+outboxes = {}          # writer -> asyncio.Queue
+
+# 서버 종료 중이면 퇴장 안내를 보내지 않음
+shutting_down = False
+
+MAX_LINE = 64 * 1024   # 한 줄 최대 길이 (넘으면 접속 끊음 -> 접속당 버퍼 메모리 제한)
+OUTBOX_SIZE = 256      # 못 보낸 메시지가 이만큼 쌓이면 못 따라오는 클라이언트로 보고 끊음
+DEAD_PEER_TIMEOUT = 30  # 응답 없는 상대를 정리하기까지의 시간(초)
+SEND_TIMEOUT = 5.0     # 한 번 몰아 보낸 데이터가 이 시간 안에 다 안 빠지면 끊음(초)
+FLUSH_AND_CLOSE = None  # 큐에 넣으면 sender가 앞의 메시지를 다 보내고 종료
+
+# 고정 안내 문구는 미리 인코딩해 두고 그대로 씀
+NL = b'\n'
+MSG_EMPTY_NICK = '[SYSTEM] 닉네임이 비었습니다.\n'.encode('utf-8')
+MSG_DUP_NICK = '[SYSTEM] 이미 사용 중인 닉네임입니다.\n'.encode('utf-8')
+MSG_WELCOME = '[SYSTEM] 연결됨. "/종료" 종료, "/w 닉 메시지" 귓속말.\n'.encode('utf-8')
+MSG_WHISPER_USAGE = '[SYSTEM] 사용법: /w 닉네임 메시지\n'.encode('utf-8')
+# 입장/퇴장 안내는 bytes 틀에 인코딩된 닉네임만 끼워 넣음 (str 조립 + 인코딩 생략)
+TPL_JOIN = '[SYSTEM] [%b] 님이 입장하셨습니다.\n'.encode('utf-8')
+TPL_LEAVE = '[SYSTEM] [%b] 님이 퇴장하셨습니다.\n'.encode('utf-8')
+
+
+def send(w: asyncio.StreamWriter, data: bytes) -> None:
+    # 바로 쓰지 않고 큐에 넣기만 함 -> 느린 상대를 기다리느라 다른 전송이 막히지 않음
+    q = outboxes.get(w)
+    if q is None:
+        return
+    try:
+        q.put_nowait(data)
+    except asyncio.QueueFull:
+        # 큐가 꽉 참 = 받는 속도가 못 따라옴. 서버 메모리가 계속 늘지 않게 끊음
+        remove_client(w)
+
+
+async def sender(writer: asyncio.StreamWriter, q: asyncio.Queue) -> None:
+    try:
+        while True:
+            # 밀려 있는 메시지는 한꺼번에 꺼내 writelines 한 번으로 보냄 (send syscall 1번)
+            frames = [await q.get()]
+            while not q.empty():
+                frames.append(q.get_nowait())
+            if writer.is_closing():
+                # 이미 끊긴 상대 (write는 예외 대신 경고 로그만 남기므로 먼저 확인)
+                break
+            # None(FLUSH_AND_CLOSE)이 오면 그 앞까지 다 보내고 끝냄
+            last = FLUSH_AND_CLOSE in frames
+            if last:
+                frames = frames[:frames.index(FLUSH_AND_CLOSE)]
+            writer.writelines(frames)
+            # 받지 않는 상대 때문에 drain이 끝없이 기다리지 않도록 시간 제한
+            await asyncio.wait_for(writer.drain(), SEND_TIMEOUT)
+            if last:
+                break
+    except (OSError, asyncio.TimeoutError):
+        pass
+    # 보내다 실패하면 정리
+    remove_client(writer)
 
 
 def broadcast(text: str, exclude=None) -> None:
-    data = (text + '\n').encode('utf-8', errors='replace')
-    with clients_lock:
-        targets = [s for s in clients.keys() if s is not exclude]
-    for s in targets:
-        try:
-            s.sendall(data)
-        except OSError:
-            # 보내다 실패하면 정리
-            remove_client(s)
-
-
-def remove_client(sock: socket.socket) -> None:
-    nickname = None
-    with clients_lock:
-        nickname = clients.pop(sock, None)
+    # 한 번만 인코딩해서 모든 수신자에게 같은 bytes 객체를 넘김
+    broadcast_bytes(text.encode('utf-8', errors='replace') + NL, exclude)
+
+
+def broadcast_bytes(data: bytes, exclude=None) -> None:
+    for w in clients:
+        if w is not exclude:
+            send(w, data)
+
+
+def add_client(writer: asyncio.StreamWriter, nickname: str) -> None:
+    global clients, nick_to_writer
+    new = dict(clients)
+    new[writer] = nickname
+    new_index = dict(nick_to_writer)
+    new_index[nickname] = writer
+    clients, nick_to_writer = new, new_index
+
+
+def unregister_client(writer: asyncio.StreamWriter) -> None:
+    # 접속자 목록에서만 뺌 (더 이상 방송/귓속말 대상이 아님). 소켓과 보낼 큐는 그대로 둠
+    global clients, nick_to_writer
+    if writer not in clients:
+        return
+    new = dict(clients)
+    nickname = new.pop(writer)
+    new_index = dict(nick_to_writer)
+    if new_index.get(nickname) is writer:
+        del new_index[nickname]
+    clients, nick_to_writer = new, new_index
+    if not shutting_down:
+        # 정리는 바로 끝내고, 퇴장 안내 방송은 다음 루프 차례에 따로 돌림
+        # (방송 중 실패 -> 또 정리 -> 또 방송… 으로 호출이 깊어지지 않음)
+        asyncio.get_running_loop().call_soon(
+            broadcast_bytes, TPL_LEAVE % nickname.encode('utf-8'))
+
+
+def remove_client(writer: asyncio.StreamWriter) -> None:
+    unregister_client(writer)
+    outboxes.pop(writer, None)
+    writer.close()
+
+
+async def flush_and_close(writer: asyncio.StreamWriter, sender_task: asyncio.Task) -> None:
+    # 정상 종료(/종료, EOF) 때는 큐에 남은 메시지를 다 보낸 뒤 닫음
+    # (바로 닫으면 몰아 보낸 줄에 대한 응답이 중간에 버려짐)
+    unregister_client(writer)
+    q = outboxes.get(writer)
+    if q is None:
+        # 이미 정리됨 (큐가 넘쳐 끊긴 경우 등)
+        return
+    try:
+        q.put_nowait(FLUSH_AND_CLOSE)
+    except asyncio.QueueFull:
+        return
     try:
-        sock.close()
+        # 시간 안에 못 보내면 wait_for가 sender를 취소함
+        await asyncio.wait_for(sender_task, SEND_TIMEOUT)
+    except asyncio.TimeoutError:
+        pass
+
+
+def set_sockopt(sock: socket.socket, level: int, option: int, value: int) -> None:
+    # 튜닝용 옵션이라 플랫폼이 지원하지 않으면(OSError) 건너뛰고 접속은 그대로 받음
+    try:
+        sock.setsockopt(level, option, value)
     except OSError:
         pass
-    if nickname:
-        broadcast(f'[SYSTEM] [{nickname}] 님이 퇴장하셨습니다.')
 
 
-def handle_client(sock: socket.socket) -> None:
+def tune_socket(writer: asyncio.StreamWriter) -> None:
+    sock = writer.get_extra_info('socket')
+    if sock is None:
+        return
+    # 짧은 채팅 줄이 Nagle/지연 ACK에 묶여 ~40ms씩 늦어지지 않게
+    # (asyncio도 TCP 연결에 기본으로 켜 주지만 명시)
+    set_sockopt(sock, socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # 케이블이 뽑히는 등 조용히 죽은 상대에게 계속 방송하지 않도록 빨리 끊기게 함
+    set_sockopt(sock, socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        set_sockopt(sock, socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, DEAD_PEER_TIMEOUT // 3)
+        set_sockopt(sock, socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, DEAD_PEER_TIMEOUT // 6)
+        set_sockopt(sock, socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4)
+    if hasattr(socket, 'TCP_USER_TIMEOUT'):
+        # 보낸 데이터가 이 시간 동안 ACK 안 되면 커널이 연결을 끊음 (리눅스)
+        set_sockopt(sock, socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, DEAD_PEER_TIMEOUT * 1000)
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    sender_task = None
+    graceful = False
     try:
-        nickname = recv_line(sock)
+        # 여기서 무슨 예외가 나도 아래 finally에서 접속 정리
+        tune_socket(writer)
+        nickname = await recv_line(reader)
         if nickname is None or not nickname.strip():
-            sock.sendall('[SYSTEM] 닉네임이 비었습니다.\n'.encode('utf-8'))
-            sock.close()
+            writer.write(MSG_EMPTY_NICK)
+            await writer.drain()
+            writer.close()
             return
         nickname = nickname.strip()
+        # 확인과 등록 사이에 await가 없으므로 같은 닉네임이 동시에 들어올 수 없음
+        # -> nick_to_writer 조회 결과가 항상 유일함
+        if nickname in nick_to_writer:
+            writer.write(MSG_DUP_NICK)
+            await writer.drain()
+            writer.close()
+            return
 
-        with clients_lock:
-            clients[sock] = nickname
+        outboxes[writer] = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        sender_task = asyncio.create_task(sender(writer, outboxes[writer]))
+        add_client(writer, nickname)
 
-        sock.sendall('[SYSTEM] 연결됨. "/종료" 종료, "/w 닉 메시지" 귓속말.\n'.encode('utf-8'))
-        broadcast(f'[SYSTEM] [{nickname}] 님이 입장하셨습니다.', exclude=None)
+        send(writer, MSG_WELCOME)
+        broadcast_bytes(TPL_JOIN % nickname.encode('utf-8'))
 
         while True:
-            line = recv_line(sock)
+            line = await recv_line(reader)
             if line is None:
+                # EOF(상대가 쓰기만 닫음)도 정상 종료 -> 남은 메시지는 받아 가게 함
+                graceful = True
                 break
             text = line.strip()
             if not text:
                 continue
 
-            if text == '/종료':
+            # 첫 단어로 명령 처리 함수를 바로 찾음 (partition 한 번 + dict 조회)
+            cmd, _, rest = text.partition(' ')
+            handler = COMMANDS.get(cmd)
+            if handler is None:
+                broadcast(f'{nickname}> {text}')
+            elif handler(nickname, writer, rest):
+                graceful = True
                 break
-
-            if text.startswith('/w '):
-                # /w target message
-                parts = text.split(' ', 2)
-                if len(parts) < 3:
-                    sock.sendall('[SYSTEM] 사용법: /w 닉네임 메시지\n'.encode('utf-8'))
-                    continue
-                _, target_name, content = parts
-                send_whisper(nickname, target_name, content, sock)
-                continue
-
-            broadcast(f'{nickname}> {text}')
+            # readuntil은 버퍼에 줄이 남아 있으면 양보 없이 바로 돌아오므로, 몰아 보낸 줄을
+            # 연달아 처리하느라 sender()들이 밀려 큐가 차지 않게 한 번씩 차례를 넘김
+            await asyncio.sleep(0)
+    except OSError:
+        # 접속이 먼저 끊긴 경우 (스레드 버전에서는 스레드가 조용히 죽던 경로)
+        pass
     finally:
-        remove_client(sock)
+        if graceful and sender_task is not None:
+            await flush_and_close(writer, sender_task)
+        # 오류/시간 초과 때는 남은 메시지를 버리고 바로 끊음
+        remove_client(writer)
+        if sender_task is not None:
+            sender_task.cancel()
 
 
-def send_whisper(sender: str, target_name: str, content: str, sender_sock: socket.socket) -> None:
-    target_sock = None
-    with clients_lock:
-        for s, name in clients.items():
-            if name == target_name:
-                target_sock = s
-                break
-    if target_sock is None:
-        sender_sock.sendall(f'[SYSTEM] 대상 [{target_name}] 없음.\n'.encode('utf-8'))
+def send_whisper(sender_name: str, target_name: str, content: str,
+                 sender_writer: asyncio.StreamWriter) -> None:
+    target_writer = nick_to_writer.get(target_name)
+    if target_writer is None:
+        send(sender_writer, f'[SYSTEM] 대상 [{target_name}] 없음.'.encode('utf-8') + NL)
         return
-    for s, msg in ((target_sock, f'(귓속말) {sender}> {content}'),
-                   (sender_sock, f'(귓속말 보냄) {target_name}에게> {content}')):
-        try:
-            s.sendall((msg + '\n').encode('utf-8'))
-        except OSError:
-            pass
-
-
-def recv_line(sock: socket.socket) -> str | None:
-    buf = b''
-    while True:
-        if b'\n' in buf:
-            line, buf = buf.split(b'\n', 1)
-            # 남은 건 버려도 단순 과제엔 충분
-            try:
-                return line.decode('utf-8', errors='replace')
-            except UnicodeDecodeError:
-                return None
-        try:
-            chunk = sock.recv(4096)
-        except OSError:
-            return None
-        if not chunk:
-            return None
-        buf += chunk
+    send(target_writer, f'(귓속말) {sender_name}> {content}'.encode('utf-8') + NL)
+    send(sender_writer, f'(귓속말 보냄) {target_name}에게> {content}'.encode('utf-8') + NL)
+
+
+def cmd_quit(nickname: str, writer: asyncio.StreamWriter, rest: str) -> bool:
+    return True
+
+
+def cmd_whisper(nickname: str, writer: asyncio.StreamWriter, rest: str) -> bool:
+    # /w target message
+    target_name, _, content = rest.partition(' ')
+    if not target_name or not content:
+        send(writer, MSG_WHISPER_USAGE)
+    else:
+        send_whisper(nickname, target_name, content, writer)
+    return False
+
+
+# 명령 -> 처리 함수. True를 돌려주면 접속 종료
+COMMANDS = {
+    '/종료': cmd_quit,
+    '/w': cmd_whisper,
+}
+
+
+async def recv_line(reader: asyncio.StreamReader) -> str | None:
+    # 줄 버퍼링은 StreamReader가 해 줌 (내부 bytearray에 이어 붙이므로 긴 줄도 선형 시간,
+    # 남은 바이트도 다음 줄로 보존됨)
+    try:
+        line = await reader.readuntil(NL)
+    except asyncio.IncompleteReadError:
+        # EOF (끝에 개행 없이 끊긴 조각 포함)
+        return None
+    except asyncio.LimitOverrunError:
+        # MAX_LINE을 넘도록 개행이 안 옴
+        return None
+    except OSError:
+        return None
+    # errors='replace'라 깨진 바이트가 와도 예외가 나지 않음
+    return line[:-1].decode('utf-8', errors='replace')
+
+
+async def serve(host: str, port: int) -> None:
+    global shutting_down
+    # 접속마다 스레드를 띄우지 않고 이벤트 루프(리눅스는 epoll) 하나로 모든 소켓 처리
+    # 재시작 직후 한꺼번에 다시 붙는 접속도 받아내도록 backlog는 OS 최대치.
+    # reuse_port는 켜지 않음: 접속자 목록이 프로세스 메모리에 있어서
+    # 서버가 둘 뜨면 채팅방이 조용히 둘로 갈라짐
+    srv = await asyncio.start_server(handle_client, host, port,
+                                     backlog=socket.SOMAXCONN, limit=MAX_LINE)
+    print(f'[INFO] listening on {host}:{port}')
+    try:
+        async with srv:
+            await srv.serve_forever()
+    finally:
+        # 종료 때 한 명씩 빠질 때마다 남은 전원에게 퇴장 안내를 보내면 O(N²).
+        # 안내는 끄고 전체 접속을 한 번만 돌며 닫음 -> O(N)
+        shutting_down = True
+        for w in clients:
+            w.close()
 
 
 def main() -> None:
@@ -122,19 +299,7 @@ def main() -> None:
         print('사용법: python server.py <host> <port>')
         sys.exit(1)
 
-    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    srv.bind((host, port))
-    srv.listen(50)
-    print(f'[INFO] listening on {host}:{port}')
-
-    try:
-        while True:
-            c, a = srv.accept()
-            t = threading.Thread(target=handle_client, args=(c,), daemon=True)
-            t.start()
-    finally:
-        srv.close()
+    asyncio.run(serve(host, port))
 
 
 if __name__ == '__main__':
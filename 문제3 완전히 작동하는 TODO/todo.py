@@ -1,22 +1,65 @@
 # todo.py
 from __future__ import annotations
 
+import atexit
 import csv
 import json
 import os
+import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, FastAPI, HTTPException
 from model import TodoItem
 
+try:
+    # 설치돼 있으면 더 빠른 orjson 으로 직렬화 (pip install orjson), 없으면 표준 json
+    import orjson
+except ImportError:
+    orjson = None
+
 # -----------------------------
 # 전역 리스트 (요구사항)
 # -----------------------------
 todo_list: List[Dict[str, Any]] = []
+# _id -> 항목 (todo_list 와 같은 dict 객체를 가리키는 색인, 단건 조회 O(1))
+todo_index: Dict[int, Dict[str, Any]] = {}
 
 # CSV 저장소 경로 (DB 금지 조건 → CSV 사용)
 CSV_PATH = 'todo_store.csv'
+# CSV는 변경 기록(로그)으로 쓴다: op = add / update / delete
+# 수정·삭제 때 파일 전체를 다시 쓰지 않고 한 줄만 덧붙임
+CSV_FIELDS = ['ts', 'op', 'json']
+# 로그 줄 수가 살아 있는 항목 수의 이 배수를 넘으면 시작할 때 압축
+COMPACT_RATIO = 2
+
+# append 용 파일 핸들/writer (처음 쓸 때 한 번 열고 계속 재사용)
+_csv_fh = None
+_csv_writer: Optional[csv.DictWriter] = None
+
+# -----------------------------
+# JSON 유틸
+# -----------------------------
+if orjson is not None:
+    # orjson 은 64비트를 넘는 정수를 못 다룸: dumps 는 TypeError, loads 는 조용히 float 로 바꿈.
+    # 그런 값이 있을 수 있는 경우만 표준 json 으로 처리 (19자리 이상 숫자가 보이면 표준 json)
+    _LONG_DIGITS = re.compile(r'\d{19}')
+
+    def to_json(item: Dict[str, Any]) -> str:
+        try:
+            return orjson.dumps(item).decode('utf-8')
+        except TypeError:
+            return json.dumps(item, ensure_ascii=False)
+
+    def from_json(text: str) -> Any:
+        if _LONG_DIGITS.search(text):
+            return json.loads(text)
+        return orjson.loads(text)
+else:
+    def to_json(item: Dict[str, Any]) -> str:
+        return json.dumps(item, ensure_ascii=False)
+
+    from_json = json.loads
 
 # -----------------------------
 # CSV 유틸
@@ -25,57 +68,110 @@ def ensure_csv_header() -> None:
     """CSV 파일이 없으면 헤더 포함하여 생성한다."""
     if not os.path.exists(CSV_PATH):
         with open(CSV_PATH, mode='w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['ts', 'json'])
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
             writer.writeheader()
 
 
+def csv_writer() -> csv.DictWriter:
+    """append 모드 파일과 DictWriter 를 한 번만 만들어 재사용한다."""
+    global _csv_fh, _csv_writer
+    if _csv_writer is None:
+        ensure_csv_header()
+        # 줄 단위 버퍼링: 한 줄 쓸 때마다 OS로 넘어가므로 비정상 종료에도 기록이 남음
+        _csv_fh = open(CSV_PATH, mode='a', newline='', encoding='utf-8', buffering=1)
+        _csv_writer = csv.DictWriter(_csv_fh, fieldnames=CSV_FIELDS)
+    return _csv_writer
+
+
+def close_csv() -> None:
+    """열어 둔 append 핸들을 닫는다. (파일을 바꿔 끼우기 전, 종료 시)"""
+    global _csv_fh, _csv_writer
+    if _csv_fh is not None:
+        _csv_fh.close()
+    _csv_fh = None
+    _csv_writer = None
+
+
+atexit.register(close_csv)
+
+
 def load_from_csv() -> None:
-    """CSV 파일에서 데이터를 읽어 todo_list 에 적재한다."""
+    """CSV 변경 기록을 처음부터 재생하여 todo_list 에 적재한다."""
     ensure_csv_header()
     todo_list.clear()
+    todo_index.clear()
+    deleted = set()  # 삭제된 항목 객체의 id() (리스트에서는 마지막에 한 번에 걸러냄)
+    rows = 0
     with open(CSV_PATH, mode='r', newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
+        # op 컬럼이 없는 예전 형식은 모든 줄을 add 로 보고, 읽은 뒤 새 형식으로 다시 씀
+        legacy = 'op' not in (reader.fieldnames or [])
         for row in reader:
+            rows += 1
             try:
-                data = json.loads(row.get('json', '{}'))
-                if isinstance(data, dict):
-                    todo_list.append(data)
+                data = from_json(row.get('json') or '{}')
             except json.JSONDecodeError:
-                # 손상된 라인은 무시
+                # 손상된 라인은 무시 (orjson.JSONDecodeError 도 이 예외의 하위 클래스)
+                continue
+            if not isinstance(data, dict):
                 continue
 
-
-def append_to_csv(item: Dict[str, Any]) -> None:
-    """단일 항목을 CSV 파일에 append 한다."""
-    ensure_csv_header()
-    with open(CSV_PATH, mode='a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['ts', 'json'])
-        writer.writerow({
-            'ts': datetime.now().isoformat(timespec='seconds'),
-            'json': json.dumps(item, ensure_ascii=False),
-        })
-
-
-def rewrite_all_csv() -> None:
-    """todo_list 전체를 기준으로 CSV 파일을 통째로 다시 쓴다."""
-    ensure_csv_header()
-    with open(CSV_PATH, mode='w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['ts', 'json'])
-        writer.writeheader()
-        for item in todo_list:
-            writer.writerow({
-                'ts': datetime.now().isoformat(timespec='seconds'),
-                'json': json.dumps(item, ensure_ascii=False),
-            })
+            op = row.get('op') or 'add'
+            if op == 'add':
+                todo_list.append(data)
+                index_item(data)
+            elif op == 'update':
+                item = todo_index.get(data.get('_id'))
+                if item is not None:
+                    # 리스트 위치를 유지하도록 같은 객체의 내용을 교체
+                    item.clear()
+                    item.update(data)
+            elif op == 'delete':
+                item = todo_index.pop(data.get('_id'), None)
+                if item is not None:
+                    deleted.add(id(item))
+
+    if deleted:
+        todo_list[:] = [item for item in todo_list if id(item) not in deleted]
+    if legacy or rows > COMPACT_RATIO * len(todo_list):
+        compact_csv()
+
+
+def append_to_csv(item: Dict[str, Any], op: str = 'add') -> None:
+    """변경 기록 한 줄을 CSV 파일에 append 한다."""
+    csv_writer().writerow({
+        'ts': datetime.now().isoformat(timespec='seconds'),
+        'op': op,
+        'json': to_json(item),
+    })
+
+
+def compact_csv() -> None:
+    """쌓인 변경 기록을 현재 todo_list 의 add 줄만 남도록 통째로 다시 쓴다."""
+    tmp_path = CSV_PATH + '.tmp'
+    ts = datetime.now().isoformat(timespec='seconds')
+    with open(tmp_path, mode='w', newline='', encoding='utf-8') as f:
+        # 행마다 dict 를 만들지 않고 CSV_FIELDS 순서의 튜플을 writerows 로 한 번에 넘김
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows((ts, 'add', to_json(item)) for item in todo_list)
+    # 다 쓴 뒤 바꿔 끼움 -> 쓰는 도중 죽어도 기존 파일은 그대로
+    # (열어 둔 핸들은 옛 파일을 가리키므로 먼저 닫고, 다음 append 때 새로 엶)
+    close_csv()
+    os.replace(tmp_path, CSV_PATH)
 
 # -----------------------------
 # 헬퍼
 # -----------------------------
-def find_index_by_id(todo_id: int) -> Optional[int]:
-    for idx, item in enumerate(todo_list):
-        if item.get('_id') == todo_id:
-            return idx
-    return None
+def index_item(item: Dict[str, Any]) -> None:
+    """정수 _id 를 가진 항목을 색인에 등록한다. (같은 _id 는 먼저 들어온 항목 유지)"""
+    todo_id = item.get('_id')
+    if isinstance(todo_id, int):
+        todo_index.setdefault(todo_id, item)
+
+
+def find_by_id(todo_id: int) -> Optional[Dict[str, Any]]:
+    return todo_index.get(todo_id)
 
 # -----------------------------
 # FastAPI / Router (요구사항)
@@ -94,12 +190,20 @@ async def add_todo(payload: Dict[str, Any]) -> Dict[str, Any]:
         raise HTTPException(status_code=400, detail='요청 본문이 비어 있습니다. 최소 1개 이상의 키-값을 전달하세요.')
 
     if '_id' not in payload:
-        payload['_id'] = int(datetime.now().timestamp())
+        # 초 단위 타임스탬프라 같은 초에 여러 건이 들어오면 겹치므로 비는 값까지 올린다
+        new_id = int(datetime.now().timestamp())
+        while new_id in todo_index:
+            new_id += 1
+        payload['_id'] = new_id
+    elif isinstance(payload['_id'], int) and payload['_id'] in todo_index:
+        raise HTTPException(status_code=409, detail='이미 존재하는 ID입니다.')
     if '_created_at' not in payload:
         payload['_created_at'] = datetime.now().isoformat(timespec='seconds')
 
-    todo_list.append(payload)
+    # 파일에 먼저 기록하고 나서 메모리에 반영 (기록이 실패하면 메모리도 그대로 -> 디스크와 어긋나지 않음)
     append_to_csv(payload)
+    todo_list.append(payload)
+    index_item(payload)
     return {'result': 'ok', 'added': payload}
 
 
@@ -115,10 +219,10 @@ async def get_single_todo(todo_id: int) -> Dict[str, Any]:
     개별 조회 (GET)
     경로 매개변수로 _id를 받아 단일 항목 반환.
     """
-    idx = find_index_by_id(todo_id)
-    if idx is None:
+    item = find_by_id(todo_id)
+    if item is None:
         raise HTTPException(status_code=404, detail='해당 ID의 항목을 찾을 수 없습니다.')
-    return {'todo': todo_list[idx]}
+    return {'todo': item}
 
 
 @router.put('/todo/{todo_id}')
@@ -127,26 +231,24 @@ async def update_todo(todo_id: int, patch: TodoItem) -> Dict[str, Any]:
     수정 (PUT)
     경로 매개변수로 _id 지정, body는 TodoItem (Optional 필드 → 부분 수정 허용)
     """
-    idx = find_index_by_id(todo_id)
-    if idx is None:
+    item = find_by_id(todo_id)
+    if item is None:
         raise HTTPException(status_code=404, detail='해당 ID의 항목을 찾을 수 없습니다.')
 
-    original = todo_list[idx].copy()
-    updates = {k: v for k, v in patch.model_dump().items() if v is not None}
+    original = item.copy()
+    # None(미전달) 필드는 pydantic 이 덤프 단계에서 바로 뺌
+    # (TodoItem 에는 _id/_created_at 필드가 없고 모르는 키는 무시되므로 예약 메타키도 들어올 수 없음)
+    updates = patch.model_dump(exclude_none=True)
 
     if not updates:
         # 빈 업데이트 방지
         raise HTTPException(status_code=400, detail='수정할 값이 없습니다. 최소 1개 이상의 필드를 전달하세요.')
 
-    # 예약 메타키 보호
-    updates.pop('_id', None)
-    updates.pop('_created_at', None)
-
-    todo_list[idx].update(updates)
-    todo_list[idx]['_updated_at'] = datetime.now().isoformat(timespec='seconds')
-
-    rewrite_all_csv()
-    return {'result': 'ok', 'before': original, 'after': todo_list[idx]}
+    updated = {**item, **updates, '_updated_at': datetime.now().isoformat(timespec='seconds')}
+    # 기록이 성공한 뒤에만 실제 항목을 바꿈 (색인/리스트가 같은 dict 를 가리키므로 제자리 갱신)
+    append_to_csv(updated, op='update')
+    item.update(updated)
+    return {'result': 'ok', 'before': original, 'after': item}
 
 
 @router.delete('/todo/{todo_id}')
@@ -155,12 +257,14 @@ async def delete_single_todo(todo_id: int) -> Dict[str, Any]:
     삭제 (DELETE)
     경로 매개변수로 _id 지정하여 삭제.
     """
-    idx = find_index_by_id(todo_id)
-    if idx is None:
+    removed = find_by_id(todo_id)
+    if removed is None:
         raise HTTPException(status_code=404, detail='해당 ID의 항목을 찾을 수 없습니다.')
 
-    removed = todo_list.pop(idx)
-    rewrite_all_csv()
+    append_to_csv({'_id': todo_id}, op='delete')
+    del todo_index[todo_id]
+    # 리스트에서는 같은 객체를 찾아 제거 (dict 비교 전에 동일성 비교로 바로 걸림)
+    todo_list.remove(removed)
     return {'result': 'ok', 'deleted': removed}
 
 
@@ -1,14 +1,24 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from http.server import SimpleHTTPRequestHandler, HTTPServer
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from urllib.request import urlopen
 from urllib.error import URLError
 from datetime import datetime, timezone
 from pathlib import Path
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import hashlib
+import html
 import json
 import os
 import csv
+import mmap
+import socket
+import struct
+import threading
+import time
 
 # ===== 설정 =====
 HOST = '0.0.0.0'
@@ -17,10 +27,62 @@ WWW_DIR = Path('www')
 IMG_DIR = WWW_DIR / 'images'
 LOG_DIR = Path('logs')
 ACCESS_LOG = LOG_DIR / 'access_log.csv'
+# write_if_changed 가 쓰는 해시 보관 폴더 (문서 루트 밖이라 외부에서 받아 갈 수 없음)
+HASH_DIR = LOG_DIR / '.cache'
+
+# /stats 용 경로별 요청 수. 시작할 때 로그를 한 번 읽어 채우고 이후엔 요청마다 갱신
+# (/stats 를 볼 때마다 CSV 전체를 다시 세지 않음)
+PATH_COUNTS = Counter()
+TOTAL_HITS = 0
+STATS_LOCK = threading.Lock()
+
+# 접근 로그 append 핸들 (요청마다 열고 닫지 않고 한 번 열어 재사용, STATS_LOCK 으로 보호)
+_log_fh = None
+_log_writer = None
+
+# index.html 내용 (ensure_site_files 에서 채움)
+INDEX_BYTES = b''
+
+# 위치 조회 결과 캐시: ip -> (geo, 만료 시각). 성공은 만료 없음(None), 실패는 잠시 뒤 재시도
+# 조회는 백그라운드 스레드에서 하고 요청은 기다리지 않음 (처음 온 IP는 geo 공란으로 기록)
+GEO_CACHE = {}
+GEO_PENDING = set()
+GEO_LOCK = threading.Lock()
+GEO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='geo')
+GEO_CACHE_MAX = 4096
+GEO_FAIL_TTL = 300  # 초
+
+# 조회를 건너뛸 사설/루프백 대역: (네트워크, 마스크) 정수 쌍
+PRIVATE_RANGES = (
+    (0x7F000000, 0xFF000000),  # 127.0.0.0/8
+    (0x0A000000, 0xFF000000),  # 10.0.0.0/8
+    (0xC0A80000, 0xFFFF0000),  # 192.168.0.0/16
+    (0xAC100000, 0xFFF00000),  # 172.16.0.0/12
+)
+
+
+def write_if_changed(path: Path, content: str) -> None:
+    """
+    생성한 내용이 지난번에 쓴 것과 다를 때만 파일을 쓴다.
+    지난번 내용의 SHA-256 은 HASH_DIR 아래 WWW_DIR 기준 같은 경로의 <파일명>.sha256 에 보관
+    (예: www/images/a.svg -> logs/.cache/images/a.svg.sha256, 문서 루트에는 두지 않음)
+    (내용이 그대로면 디스크 쓰기 없음, 생성 코드가 바뀌면 새로 씀)
+    """
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    rel = path.relative_to(WWW_DIR)
+    sidecar = HASH_DIR / rel.with_name(f'{rel.name}.sha256')
+    # 예전 버전이 문서 루트에 남긴 해시 파일은 지움 (외부에 노출되지 않게)
+    path.with_name(f'.{path.name}.sha256').unlink(missing_ok=True)
+    if path.exists() and sidecar.exists() and sidecar.read_text(encoding='ascii') == digest:
+        return
+    path.write_text(content, encoding='utf-8')
+    sidecar.parent.mkdir(parents=True, exist_ok=True)
+    sidecar.write_text(digest, encoding='ascii')
 
 
 def ensure_site_files() -> None:
     """초기 실행 시 정적 파일과 폴더를 준비한다."""
+    global INDEX_BYTES
     WWW_DIR.mkdir(parents=True, exist_ok=True)
     IMG_DIR.mkdir(parents=True, exist_ok=True)
     LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -39,9 +101,10 @@ def ensure_site_files() -> None:
         'Raid the stars, rule the trade lanes.</text>'
         '</svg>'
     )
-    (IMG_DIR / 'space_pirates.svg').write_text(svg, encoding='utf-8')
+    write_if_changed(IMG_DIR / 'space_pirates.svg', svg)
 
     # index.html(요구사항: 우주 해적 소개 + 이미지)
+    index_file = WWW_DIR / 'index.html'
     index_html = f"""<!doctype html>
 <html lang='ko'>
 <head>
@@ -99,7 +162,7 @@ def ensure_site_files() -> None:
 </body>
 </html>
 """
-    (WWW_DIR / 'index.html').write_text(index_html, encoding='utf-8')
+    write_if_changed(index_file, index_html)
 
     # 접근 로그 헤더가 없다면 생성
     if not ACCESS_LOG.exists():
@@ -107,20 +170,57 @@ def ensure_site_files() -> None:
             writer = csv.writer(f)
             writer.writerow(['timestamp_utc', 'client_ip', 'path', 'user_agent', 'geo'])
 
+    # 루트 페이지는 메모리에 올려 두고 요청마다 파일을 다시 읽지 않음
+    INDEX_BYTES = index_file.read_bytes()
+
 
 def lookup_geo(ip: str) -> str:
     """
     보너스: 클라이언트 IP를 간단히 위치 조회한다.
-    - 표준 라이브러리(urllib)만 사용
+    - 캐시에 있으면 바로 반환, 없으면 백그라운드 조회를 걸어 두고 빈 문자열 반환
     - 외부 네트워크 불가/실패 시 빈 문자열 반환
     - 사설망(예: 127.0.0.1, 10.x, 192.168.x)은 조회 의미가 적으므로 건너뜀
     """
-    private_prefixes = ('127.', '10.', '192.168.', '172.16.', '172.17.', '172.18.', '172.19.',
-                        '172.20.', '172.21.', '172.22.', '172.23.', '172.24.', '172.25.',
-                        '172.26.', '172.27.', '172.28.', '172.29.', '172.30.', '172.31.')
-    if ip.startswith(private_prefixes):
+    if is_private_ip(ip):
         return ''
 
+    with GEO_LOCK:
+        hit = GEO_CACHE.get(ip)
+        if hit is not None and (hit[1] is None or hit[1] > time.monotonic()):
+            return hit[0]
+        if ip in GEO_PENDING:
+            return ''
+        GEO_PENDING.add(ip)
+    GEO_POOL.submit(_geo_worker, ip)
+    return ''
+
+
+def is_private_ip(ip: str) -> bool:
+    """IPv4 주소를 정수로 바꿔 사설 대역 마스크와 비교한다. (IPv6 등은 False)"""
+    try:
+        n = struct.unpack('>I', socket.inet_aton(ip))[0]
+    except OSError:
+        return False
+    return any(n & mask == net for net, mask in PRIVATE_RANGES)
+
+
+def _geo_worker(ip: str) -> None:
+    """백그라운드에서 조회하고 결과를 캐시에 넣는다."""
+    geo = ''
+    try:
+        geo = fetch_geo(ip)
+    finally:
+        expires = None if geo else time.monotonic() + GEO_FAIL_TTL
+        with GEO_LOCK:
+            GEO_PENDING.discard(ip)
+            if ip not in GEO_CACHE and len(GEO_CACHE) >= GEO_CACHE_MAX:
+                # 가장 먼저 들어온 항목부터 버림 (dict는 삽입 순서 유지)
+                del GEO_CACHE[next(iter(GEO_CACHE))]
+            GEO_CACHE[ip] = (geo, expires)
+
+
+def fetch_geo(ip: str) -> str:
+    """ip-api.com 으로 실제 위치 조회를 한다(최대 2.5초 대기)."""
     url = f'http://ip-api.com/json/{ip}?fields=status,country,regionName,city,timezone,query'
     try:
         with urlopen(url, timeout=2.5) as resp:
@@ -137,33 +237,72 @@ def lookup_geo(ip: str) -> str:
     return ''
 
 
+def _path_field(record: bytes) -> str:
+    """접근 로그 한 레코드(bytes)에서 path 컬럼(3번째)만 꺼낸다."""
+    parts = record.split(b',', 3)
+    if len(parts) < 3:
+        return '/'
+    field = parts[2]
+    if field.startswith(b'"'):
+        # 쉼표/따옴표가 들어 있어 따옴표로 감싼 경로는 csv 모듈로 정확히 해석
+        row = next(csv.reader(record.decode('utf-8', errors='replace').splitlines(True)))
+        return row[2] if len(row) > 2 else '/'
+    return field.rstrip(b'\r\n').decode('utf-8', errors='replace')
+
+
+def load_stats() -> None:
+    """기존 접근 로그를 한 번 읽어 경로별 요청 수를 채운다."""
+    global TOTAL_HITS
+    counts = Counter()
+    if ACCESS_LOG.exists() and ACCESS_LOG.stat().st_size > 0:
+        # 로그가 커도 통째로 메모리에 올리지 않고 mmap 으로 줄 단위 스캔,
+        # 모든 컬럼을 파싱하지 않고 path 컬럼만 디코딩
+        with ACCESS_LOG.open('rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.readline()  # 헤더
+            record = b''
+            for line in iter(mm.readline, b''):
+                record += line
+                if record.count(b'"') % 2:
+                    # 따옴표 안에서 줄이 바뀜 -> 레코드가 다음 줄로 이어짐
+                    continue
+                counts[_path_field(record)] += 1
+                record = b''
+    with STATS_LOCK:
+        PATH_COUNTS.clear()
+        PATH_COUNTS.update(counts)
+        TOTAL_HITS = sum(counts.values())
+
+
+def close_access_log() -> None:
+    """열어 둔 접근 로그 핸들을 닫는다."""
+    global _log_fh, _log_writer
+    if _log_fh is not None:
+        _log_fh.close()
+    _log_fh = None
+    _log_writer = None
+
+
+atexit.register(close_access_log)
+
+
 def log_access(ip: str, path: str, user_agent: str, geo: str) -> None:
     """CSV 접근 로그에 한 줄을 추가한다."""
+    global TOTAL_HITS, _log_fh, _log_writer
     ts_utc = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S%z')
-    with ACCESS_LOG.open('a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow([ts_utc, ip, path, user_agent, geo])
-
+    with STATS_LOCK:
+        PATH_COUNTS[path] += 1
+        TOTAL_HITS += 1
 
-def render_stats_html() -> bytes:
-    """간단한 요청 통계 HTML을 생성한다(최상위 경로별 히트 수)."""
-    counts = {}
-    total = 0
-    if ACCESS_LOG.exists():
-        with ACCESS_LOG.open('r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                path = row.get('path', '/')
-                counts[path] = counts.get(path, 0) + 1
-                total += 1
+        if _log_writer is None:
+            # 줄 단위 버퍼링: 한 줄씩 바로 파일에 반영됨
+            _log_fh = ACCESS_LOG.open('a', newline='', encoding='utf-8', buffering=1)
+            _log_writer = csv.writer(_log_fh)
+        _log_writer.writerow([ts_utc, ip, path, user_agent, geo])
 
-    rows = ''.join(
-        f"<tr><td style='padding:8px;border-bottom:1px solid #1b2a4a'>{p}</td>"
-        f"<td style='padding:8px;border-bottom:1px solid #1b2a4a;text-align:right'>{c}</td></tr>"
-        for p, c in sorted(counts.items(), key=lambda x: (-x[1], x[0]))
-    ) or "<tr><td colspan='2' style='padding:12px'>기록이 없습니다.</td></tr>"
 
-    html = f"""<!doctype html>
+# /stats 페이지 틀은 한 번만 만들어 bytes 로 쪼개 둠 (요청마다는 총계와 표 행만 끼워 넣음)
+_STATS_HTML = """<!doctype html>
 <html lang='ko'>
 <head>
   <meta charset='utf-8'>
@@ -194,7 +333,30 @@ def render_stats_html() -> bytes:
   </main>
 </body>
 </html>"""
-    return html.encode('utf-8')
+_head, _rest = _STATS_HTML.split('{total}')
+_middle, _tail = _rest.split('{rows}')
+STATS_HEAD = _head.encode('utf-8')
+STATS_MIDDLE = _middle.encode('utf-8')
+STATS_TAIL = _tail.encode('utf-8')
+STATS_ROW = ("<tr><td style='padding:8px;border-bottom:1px solid #1b2a4a'>%s</td>"
+             "<td style='padding:8px;border-bottom:1px solid #1b2a4a;text-align:right'>%d</td></tr>")
+STATS_EMPTY_ROW = "<tr><td colspan='2' style='padding:12px'>기록이 없습니다.</td></tr>"
+
+
+def render_stats_html() -> bytes:
+    """간단한 요청 통계 HTML을 생성한다(최상위 경로별 히트 수)."""
+    with STATS_LOCK:
+        counts = dict(PATH_COUNTS)
+        total = TOTAL_HITS
+
+    # 경로는 요청자가 마음대로 보낼 수 있는 값이므로 HTML 이스케이프
+    rows = ''.join(
+        STATS_ROW % (html.escape(p), c)
+        for p, c in sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+    ) or STATS_EMPTY_ROW
+
+    return b''.join((STATS_HEAD, str(total).encode('ascii'), STATS_MIDDLE,
+                     rows.encode('utf-8'), STATS_TAIL))
 
 
 class SpacePirateHandler(SimpleHTTPRequestHandler):
@@ -233,21 +395,29 @@ class SpacePirateHandler(SimpleHTTPRequestHandler):
             self.wfile.write(body)
             return
 
-        # 루트는 index.html로 고정 매핑하여 확실히 200 응답
-        if self.path in ('/', '/index.html'):
-            index_file = WWW_DIR / 'index.html'
-            if index_file.exists():
-                data = index_file.read_bytes()
-                self.send_response(200)
-                self.send_header('Content-Type', 'text/html; charset=utf-8')
-                self.send_header('Content-Length', str(len(data)))
-                self.end_headers()
-                self.wfile.write(data)
-                return
+        # 루트는 index.html로 고정 매핑하여 확실히 200 응답 (시작 때 읽어 둔 내용)
+        if self.path in ('/', '/index.html') and INDEX_BYTES:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(INDEX_BYTES)))
+            self.end_headers()
+            self.wfile.write(INDEX_BYTES)
+            return
 
         # 그 외 정적 파일은 기본 처리
         super().do_GET()
 
+    def copyfile(self, source, outputfile) -> None:
+        """
+        정적 파일 본문 전송.
+        socket.sendfile 은 가능하면 os.sendfile 로 커널에서 바로 보내고(사용자 공간 복사 없음),
+        지원하지 않는 환경(Windows 등)에서는 알아서 일반 send 반복으로 대체한다.
+        """
+        if outputfile is self.wfile:
+            self.connection.sendfile(source)
+        else:
+            super().copyfile(source, outputfile)
+
     def log_message(self, fmt: str, *args) -> None:
         """
         기본 access 로그 형식을 간단히 조정.
@@ -259,8 +429,11 @@ class SpacePirateHandler(SimpleHTTPRequestHandler):
 
 def run_server() -> None:
     ensure_site_files()
+    load_stats()
     server_address = (HOST, PORT)
-    httpd = HTTPServer(server_address, SpacePirateHandler)
+    # 요청마다 스레드로 처리 -> 느린 클라이언트 하나가 다른 요청을 막지 않음
+    # (공유 상태: 통계/접근 로그는 STATS_LOCK, 위치 캐시는 GEO_LOCK 으로 보호)
+    httpd = ThreadingHTTPServer(server_address, SpacePirateHandler)
     print(f'🌌 Space Pirates server running at http://localhost:{PORT}')
     print(f'문서 루트: {WWW_DIR.resolve()}  |  접근 로그: {ACCESS_LOG.resolve()}')
     try:
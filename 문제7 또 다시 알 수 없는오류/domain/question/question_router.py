@@ -1,8 +1,8 @@
 # domain/question/question_router.py
 from __future__ import annotations
 
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from database import get_db_dep
@@ -11,8 +11,19 @@ from schemas import QuestionRead
 
 router = APIRouter(prefix='/api/question', tags=['question'])
 
+PAGE_SIZE = 50
+PAGE_SIZE_MAX = 200
+
 
 @router.get('', response_model=List[QuestionRead])
-def question_list(db: Session = Depends(get_db_dep)) -> list[Question]:
-    items = db.query(Question).order_by(Question.id.desc()).all()
+def question_list(
+    cursor_id: Optional[int] = Query(None, description='이 id 보다 오래된 질문부터 (이전 페이지 마지막 id)'),
+    limit: int = Query(PAGE_SIZE, ge=1, le=PAGE_SIZE_MAX, description='최신 순으로 최대 몇 개까지 받을지'),
+    db: Session = Depends(get_db_dep),
+) -> list[Question]:
+    # 키셋 페이지네이션: 전체를 정렬해 다 읽지 않고 id < cursor 부터 한 페이지만 읽음
+    query = db.query(Question)
+    if cursor_id is not None:
+        query = query.filter(Question.id < cursor_id)
+    items = query.order_by(Question.id.desc()).limit(limit).all()
     return items
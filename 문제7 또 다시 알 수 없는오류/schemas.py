@@ -2,14 +2,14 @@
 from __future__ import annotations
 
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class QuestionRead(BaseModel):
+    # Pydantic v2 설정 (v1 의 class Config: orm_mode = True 에 해당)
+    model_config = ConfigDict(from_attributes=True)  # False 로 바꿔 실험해 보세요.
+
     id: int
     subject: str
     content: str
     create_date: datetime
-
-    class Config:
-        orm_mode = True  # False 로 바꿔 실험해 보세요.
@@ -11,10 +11,12 @@ import argparse
 import html
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Iterable, List, Tuple
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 API_URL = 'https://news.kbs.co.kr/api/getNewestList'
@@ -25,19 +27,27 @@ TIMEOUT = 10
 TITLE_KEYS = ('newsTitle', 'title', 'headline', 'subject', 'name')
 URL_KEYS = ('link_url', 'url', 'newsUrl', 'article_url', 'path', 'link')
 
+HTTP_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+        'AppleWebKit/537.36 (KHTML, like Gecko) '
+        'Chrome/120.0.0.0 Safari/537.36'
+    ),
+    'Accept': 'application/json,text/plain,*/*',
+    'Accept-Language': 'ko,en;q=0.8'
+}
+
+# 요청마다 requests.get으로 새 연결(TCP+TLS 핸드셰이크)을 맺지 않도록
+# 세션 하나를 모듈 전체에서 같이 씀 -> 같은 호스트로 가는 요청은 연결 재사용(keep-alive)
+_SESSION = requests.Session()
+_SESSION.headers.update(HTTP_HEADERS)
+_SESSION.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20))
+_SESSION.mount('http://', HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
 
 def fetch_json(url: str, timeout: int = TIMEOUT) -> Any:
     """API에서 JSON을 받아 파이썬 객체로 반환한다."""
-    headers = {
-        'User-Agent': (
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-            'AppleWebKit/537.36 (KHTML, like Gecko) '
-            'Chrome/120.0.0.0 Safari/537.36'
-        ),
-        'Accept': 'application/json,text/plain,*/*',
-        'Accept-Language': 'ko,en;q=0.8'
-    }
-    resp = requests.get(url, headers=headers, timeout=timeout)
+    resp = _SESSION.get(url, timeout=timeout)
     resp.raise_for_status()
     try:
         return resp.json()
@@ -65,13 +75,21 @@ def as_iterable(obj: Any) -> Iterable:
     return []
 
 
-def pick_first_str(item: Dict[str, Any], keys: Tuple[str, ...]) -> str:
-    """주어진 키 후보들 중 첫 번째로 발견되는 문자열 값을 반환한다."""
+def pick_first_str(item: Dict[str, Any], keys: Tuple[str, ...],
+                   preferred: str = '') -> Tuple[str, str]:
+    """
+    주어진 키 후보들 중 첫 번째로 발견되는 문자열 값을 (키, 값)으로 반환한다.
+    preferred가 있으면 그 키부터 먼저 본다(앞 항목에서 맞았던 키).
+    """
+    if preferred:
+        val = item.get(preferred)
+        if isinstance(val, str) and val.strip():
+            return preferred, html.unescape(val.strip())
     for key in keys:
         val = item.get(key)
         if isinstance(val, str) and val.strip():
-            return html.unescape(val.strip())
-    return ''
+            return key, html.unescape(val.strip())
+    return '', ''
 
 
 def extract_headlines(payload: Any, limit: int, debug: bool = False) -> List[Tuple[str, str]]:
@@ -79,8 +97,12 @@ def extract_headlines(payload: Any, limit: int, debug: bool = False) -> List[Tup
     API 응답에서 (제목, 절대URL) 리스트를 뽑는다.
     URL이 상대경로면 BASE_URL로 보정한다.
     """
-    headlines: List[Tuple[str, str]] = []
-    seen = set()
+    # 제목 -> 절대URL. dict는 넣은 순서를 유지하므로 중복 제거와 순서 보존을 한 번에 처리
+    headlines: Dict[str, str] = {}
+    # 한 응답 안의 항목들은 스키마가 같으므로, 한 번 맞은 키를 다음 항목부터 먼저 시도
+    # (항목마다 후보 키를 처음부터 다 찾아보지 않음)
+    title_key = ''
+    url_key = ''
 
     items = list(as_iterable(payload))
     if debug:
@@ -92,28 +114,26 @@ def extract_headlines(payload: Any, limit: int, debug: bool = False) -> List[Tup
         if not isinstance(item, dict):
             continue
 
-        title = pick_first_str(item, TITLE_KEYS)
-        link = pick_first_str(item, URL_KEYS)
+        found, title = pick_first_str(item, TITLE_KEYS, title_key)
+        if found:
+            title_key = found
+        found, link = pick_first_str(item, URL_KEYS, url_key)
+        if found:
+            url_key = found
 
         if not title and debug:
             # 어떤 키가 실제로 들어있는지 힌트 제공
             sample_keys = list(item.keys())[:10]
             print(f'[디버그] 제목 키 미발견, 아이템 키 예시: {sample_keys}')
 
-        if not title:
+        if not title or title in headlines:
             continue
 
-        full_url = urljoin(BASE_URL, link) if link else ''
-        key = (title, full_url)
-
-        if title not in seen:
-            headlines.append((title, full_url))
-            seen.add(title)
-
+        headlines[title] = urljoin(BASE_URL, link) if link else ''
         if len(headlines) >= limit:
             break
 
-    return headlines
+    return list(headlines.items())
 
 
 # -------------------- 보너스: 날씨 --------------------
@@ -124,7 +144,7 @@ def get_weather_summary(city: str = 'Seoul', timeout: int = TIMEOUT) -> str:
     - requests만 사용
     """
     url = f'http://wttr.in/{city}?format=j1'
-    resp = requests.get(url, timeout=timeout)
+    resp = _SESSION.get(url, timeout=timeout)
     resp.raise_for_status()
     data = resp.json()
 
@@ -161,21 +181,30 @@ def main() -> None:
     parser.add_argument('--debug', action='store_true', help='디버그 정보 출력')
     args = parser.parse_args()
 
+    # 뉴스와 날씨는 서로 다른 호스트에서 받는 독립 요청 -> 동시에 보내서
+    # 전체 대기 시간을 (뉴스 + 날씨)가 아닌 둘 중 긴 쪽만큼으로 줄임
     try:
-        payload = fetch_json(API_URL)
-    except requests.RequestException as exc:
-        print(f'오류: KBS API 요청 실패 - {exc}')
-        sys.exit(1)
-
-    headlines = extract_headlines(payload, limit=args.limit, debug=args.debug)
-    print_headlines(headlines)
-
-    # 보너스: 현재 날씨
-    try:
-        print('\n[보너스] 현재 날씨')
-        print(' - ' + get_weather_summary(args.city))
-    except Exception as exc:
-        print(f'날씨 정보를 가져오지 못했습니다: {exc}')
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            f_news = ex.submit(fetch_json, API_URL)
+            f_weather = ex.submit(get_weather_summary, args.city)
+
+            try:
+                payload = f_news.result()
+            except requests.RequestException as exc:
+                print(f'오류: KBS API 요청 실패 - {exc}')
+                sys.exit(1)
+
+            headlines = extract_headlines(payload, limit=args.limit, debug=args.debug)
+            print_headlines(headlines)
+
+            # 보너스: 현재 날씨
+            try:
+                print('\n[보너스] 현재 날씨')
+                print(' - ' + f_weather.result())
+            except Exception as exc:
+                print(f'날씨 정보를 가져오지 못했습니다: {exc}')
+    finally:
+        _SESSION.close()
 
 
 if __name__ == '__main__':
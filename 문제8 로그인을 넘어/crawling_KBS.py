@@ -28,9 +28,10 @@ import re
 import imaplib
 import getpass
 import email
+from concurrent.futures import ThreadPoolExecutor
 from email.header import decode_header
-from html.parser import HTMLParser
-from typing import List, Set, Tuple, Dict, Optional
+from html import unescape
+from typing import List, Set, Tuple, Dict
 
 try:
     import requests
@@ -50,34 +51,16 @@ DEFAULT_HEADERS = {
 }
 
 
-class AnchorParser(HTMLParser):
-    """
-    매우 단순한 <a> 태그 텍스트 수집기.
-    - 사이트 구조 변화에 덜 민감하도록 '보이는 텍스트'만 모아 비교.
-    """
-    def __init__(self) -> None:
-        super().__init__()
-        self._in_a = False
-        self._buf: List[str] = []
-        self.texts: List[str] = []
-
-    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
-        if tag.lower() == 'a':
-            self._in_a = True
-            self._buf.clear()
-
-    def handle_endtag(self, tag: str) -> None:
-        if tag.lower() == 'a' and self._in_a:
-            text = ''.join(self._buf).strip()
-            text = re.sub(r'\s+', ' ', text)
-            if text:
-                self.texts.append(text)
-            self._in_a = False
-            self._buf.clear()
-
-    def handle_data(self, data: str) -> None:
-        if self._in_a:
-            self._buf.append(data)
+# <a> 태그 텍스트 수집용 정규식 (미리 컴파일)
+# - 사이트 구조 변화에 덜 민감하도록 '보이는 텍스트'만 모아 비교.
+# - HTMLParser로 토큰마다 파이썬 콜백을 부르는 대신 re(C 구현)가 한 번에 훑음.
+ANCHOR_RE = re.compile(r'<a\b[^>]*>(.*?)</a\s*>', re.I | re.S)
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+# 로그인 상태 판별 키워드 (하나의 정규식으로 묶어 한 번만 훑음)
+LOGIN_KEYWORDS = ('로그아웃', '내정보', '메일', 'MY', '네이버페이')
+LOGIN_RE = re.compile('|'.join(map(re.escape, LOGIN_KEYWORDS)))
 
 
 def parse_cookie_string(cookie_str: str) -> Dict[str, str]:
@@ -109,9 +92,13 @@ def extract_anchor_texts(html: str) -> Set[str]:
     """
     <a> 텍스트 집합 추출.
     """
-    parser = AnchorParser()
-    parser.feed(html)
-    return set(t for t in parser.texts if t)
+    texts: Set[str] = set()
+    for m in ANCHOR_RE.finditer(html):
+        # 안쪽 태그(<span> 등)는 지우고 엔티티(&amp; 등)는 풀어서 보이는 글자만 남김
+        text = SPACE_RE.sub(' ', unescape(TAG_RE.sub('', m.group(1)))).strip()
+        if text:
+            texts.add(text)
+    return texts
 
 
 def compare_logged_in_out(anon_html: str, login_html: str) -> Tuple[Set[str], Set[str]]:
@@ -131,9 +118,14 @@ def looks_logged_in(html: str) -> bool:
     - 로그인 상태면 보통 상단에 '로그아웃' / '메일'의 개인화 영역이 나타남.
     - 사이트 변경 가능성을 고려하여 키워드 여러 개로 확인.
     """
-    keywords = ['로그아웃', '내정보', '메일', 'MY', '네이버페이']
-    score = sum(1 for k in keywords if k in html)
-    return score >= 2
+    # 키워드마다 문서 전체를 따로 훑지 않고 한 번만 훑으면서,
+    # 서로 다른 키워드 2개가 보이는 즉시 종료(보통 상단 메뉴에서 바로 결정됨)
+    found: Set[str] = set()
+    for m in LOGIN_RE.finditer(html):
+        found.add(m.group())
+        if len(found) >= 2:
+            return True
+    return False
 
 
 def probe_login_only_area(session: requests.Session) -> str:
@@ -188,23 +180,30 @@ def list_naver_mail_subjects(user: str, app_password: str, limit: int = 20) -> L
         code, msg = M.login(user, app_password)
         if code != 'OK':
             raise RuntimeError('IMAP 로그인 실패')
-        # 받은편지함 선택
-        M.select('INBOX')
-        # 최신 메일부터 limit개
-        code, data = M.search(None, 'ALL')
+        # 받은편지함 선택 (응답에 전체 메일 수가 들어 있음)
+        code, data = M.select('INBOX')
         if code != 'OK' or not data or not data[0]:
             return subjects
-        ids = data[0].split()
-        ids = ids[-limit:]
-        for mid in reversed(ids):
-            code, msg = M.fetch(mid, '(BODY.PEEK[HEADER.FIELDS (SUBJECT)])')
-            if code != 'OK' or not msg:
-                continue
-            # msg는 튜플들의 리스트
-            raw = b''
-            for part in msg:
-                if isinstance(part, tuple):
-                    raw += part[1] or b''
+        total = int(data[0])
+        if total <= 0:
+            return subjects
+        # 최신 메일부터 limit개
+        # 메일 번호는 1..total로 빈틈없이 이어지므로 SEARCH ALL로 번호 전체를 받아 올 필요 없이
+        # 마지막 limit개 범위(예: 981:1000)를 바로 계산
+        first = max(1, total - limit + 1)
+        # 메일마다 FETCH를 따로 보내면 왕복이 limit번 -> 범위 하나로 한 번에 요청
+        code, msg = M.fetch(f'{first}:{total}', '(BODY.PEEK[HEADER.FIELDS (SUBJECT)])')
+        if code != 'OK' or not msg:
+            return subjects
+        # msg는 (b'번호 (BODY[...] {크기}', 헤더 바이트) 튜플과 b')'가 섞인 리스트.
+        # 서버는 요청 순서와 상관없이 번호 순으로 돌려줄 수 있으므로 번호로 모아 최신순 정렬
+        headers: Dict[int, bytes] = {}
+        for part in msg:
+            if isinstance(part, tuple):
+                num = int(part[0].split(None, 1)[0])
+                headers[num] = headers.get(num, b'') + (part[1] or b'')
+        for num in sorted(headers, reverse=True):
+            raw = headers[num]
             # 파싱
             try:
                 msgobj = email.message_from_bytes(raw)
@@ -242,12 +241,14 @@ def main() -> None:
     login_sess.headers.update(DEFAULT_HEADERS)
     anon.headers.update(DEFAULT_HEADERS)
 
+    # 두 요청은 서로 독립 -> 동시에 보내서 왕복 두 번을 한 번 기다리는 시간으로 줄임
+    # (세션은 각 스레드가 하나씩만 쓰므로 공유 문제 없음)
     print('\n[1] 네이버 메인 HTML 가져오는 중(비로그인)…')
-    anon_html = fetch_html(anon, NAVER_HOME)
-    print('    완료.')
-
     print('[2] 네이버 메인 HTML 가져오는 중(로그인 세션)…')
-    login_html = fetch_html(login_sess, NAVER_HOME)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        anon_f = ex.submit(fetch_html, anon, NAVER_HOME)
+        login_f = ex.submit(fetch_html, login_sess, NAVER_HOME)
+        anon_html, login_html = anon_f.result(), login_f.result()
     print('    완료.')
 
     # 3) 로그인 전/후 차이 비교(앵커 텍스트 기반 간단 비교)
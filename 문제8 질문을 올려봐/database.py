@@ -2,16 +2,34 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 
 SQLALCHEMY_DATABASE_URL = 'sqlite:///./app.db'
 
+# 동시 요청이 몰려도 커넥션을 기다리다 막히지 않도록 풀을 넉넉히 잡음
+# (SQLAlchemy 1.4 는 파일 SQLite 에 NullPool 을 쓰므로 QueuePool 을 명시)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={'check_same_thread': False},
     future=True,
+    poolclass=QueuePool,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
 )
+
+
+@event.listens_for(engine, 'connect')
+def set_sqlite_pragma(dbapi_connection, connection_record) -> None:
+    # WAL: 쓰는 중에도 다른 연결이 읽을 수 있음 / NORMAL: WAL 에서는 커밋마다 fsync 하지 않아도 안전
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 Base = declarative_base()
 
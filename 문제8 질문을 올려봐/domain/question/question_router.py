@@ -1,10 +1,14 @@
 # domain/question/question_router.py
 from __future__ import annotations
 
+import threading
+import time
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from database import get_db_dep
@@ -13,15 +17,62 @@ from schemas import QuestionCreate, QuestionRead
 
 router = APIRouter(prefix='/api/question', tags=['question'])
 
+PAGE_SIZE = 50
+PAGE_SIZE_MAX = 200
+
+# 목록 응답 캐시: (cursor_id, limit) -> (만료 시각, 직렬화된 JSON bytes)
+# 읽기가 대부분인 게시판이라 같은 페이지를 매번 DB 조회 + 직렬화하지 않고 메모리에서 바로 돌려줌.
+# 글이 등록되면 비우고, 프로세스가 여럿이어도 오래된 목록은 최대 LIST_CACHE_TTL 초만 보임
+LIST_CACHE_TTL = 2.0
+LIST_CACHE_MAX = 128
+_list_cache: Dict[Tuple[Optional[int], int], Tuple[float, bytes]] = {}
+# 등록될 때마다 1씩 올림. 조회 도중 등록이 끼면 그 결과는 캐시에 넣지 않음
+_list_cache_gen = 0
+# 동기 라우트라 요청이 스레드풀에서 동시에 돎 -> 세대 확인+저장과 세대 증가+비우기를 같은 락으로 묶음
+# (확인과 저장 사이에 등록이 끼어 등록 전 목록이 캐시에 남는 일이 없게)
+_list_cache_lock = threading.Lock()
+# FastAPI 가 response_model 로 직렬화할 때와 같은 방식(validate_python(from_attributes) + dump_json)
+# -> 캐시 미스 비용과 결과 바이트가 캐시를 안 쓸 때와 같음
+_LIST_ADAPTER = TypeAdapter(List[QuestionRead])
+
 
 @router.get('', response_model=List[QuestionRead])
-def question_list(db: Session = Depends(get_db_dep)) -> list[Question]:
-    items = db.query(Question).order_by(Question.id.desc()).all()
-    return items
+def question_list(
+    cursor_id: Optional[int] = Query(None, description='이 id 보다 오래된 질문부터 (이전 페이지 마지막 id)'),
+    limit: int = Query(PAGE_SIZE, ge=1, le=PAGE_SIZE_MAX, description='최신 순으로 최대 몇 개까지 받을지'),
+    db: Session = Depends(get_db_dep),
+) -> Response:
+    key = (cursor_id, limit)
+    hit = _list_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return Response(content=hit[1], media_type='application/json')
+
+    gen = _list_cache_gen
+    # 목록은 읽기 전용이므로 ORM 객체(identity map 등록, 상태 추적) 대신 컬럼 값만 가져옴
+    # QuestionRead 는 속성으로 읽으므로 Row 를 그대로 직렬화할 수 있음
+    # 키셋 페이지네이션: OFFSET 으로 앞 행을 건너뛰지 않고 id < cursor 로 바로 이어 읽음
+    # (id 는 기본 키라 역순 정렬 + LIMIT 이 인덱스로 바로 끝남 -> 테이블 크기와 무관하게 한 페이지 분량만 읽음)
+    stmt = (
+        select(Question.id, Question.subject, Question.content, Question.create_date)
+        .order_by(Question.id.desc())
+        .limit(limit)
+    )
+    if cursor_id is not None:
+        stmt = stmt.where(Question.id < cursor_id)
+    rows = db.execute(stmt).all()
+    body = _LIST_ADAPTER.dump_json(_LIST_ADAPTER.validate_python(rows, from_attributes=True))
+
+    with _list_cache_lock:
+        if gen == _list_cache_gen:
+            if len(_list_cache) >= LIST_CACHE_MAX:
+                _list_cache.clear()
+            _list_cache[key] = (time.monotonic() + LIST_CACHE_TTL, body)
+    return Response(content=body, media_type='application/json')
 
 
 @router.post('', response_model=QuestionRead, status_code=201)
 def question_create(data: QuestionCreate, db: Session = Depends(get_db_dep)) -> Question:
+    global _list_cache_gen
     q = Question(
         subject=data.subject,
         content=data.content,
@@ -29,5 +80,9 @@ def question_create(data: QuestionCreate, db: Session = Depends(get_db_dep)) ->
     )
     db.add(q)
     db.commit()
+    # 새 글이 목록에 바로 보이도록 캐시를 비움
+    with _list_cache_lock:
+        _list_cache_gen += 1
+        _list_cache.clear()
     db.refresh(q)
     return q
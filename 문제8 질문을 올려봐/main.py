@@ -1,15 +1,28 @@
 # main.py
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy import text
 
 from database import engine, Base
 from domain.question.question_router import router as question_router
 
-app = FastAPI(title='Mars Board – Questions (Final)')
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 요청을 받기 전에 테이블을 만들고 커넥션 하나를 미리 열어 풀을 데워 둠
+    # (첫 요청들이 한꺼번에 커넥션을 새로 여느라 느려지지 않게)
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+    yield
+    engine.dispose()
+
+
+app = FastAPI(title='Mars Board – Questions (Final)', lifespan=lifespan)
 app.include_router(question_router)
 app.mount('/frontend', StaticFiles(directory='frontend', html=True), name='frontend')
 
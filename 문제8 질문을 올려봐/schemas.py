@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from pydantic import BaseModel, constr
+from pydantic import BaseModel, ConfigDict, constr
 
 
 class QuestionCreate(BaseModel):
@@ -11,10 +11,9 @@ class QuestionCreate(BaseModel):
 
 
 class QuestionRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     subject: str
     content: str
     create_date: datetime
-
-    class Config:
-        orm_mode = True